@@ -5,10 +5,15 @@ Automates login to Indeed employer portal and downloads CSV reports
 """
 
 import os
+import re
+import random
 import time
 import asyncio
 import traceback
+from http.cookies import Morsel
 from typing import Optional, Dict, Any
+import aiohttp
+import aiofiles
 from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
 
 # Import Apify Actor
@@ -49,6 +54,14 @@ except ImportError:
 CONFIG = {
     'COOKIES_KEY': 'indeed_cookies_v1',
     'KV_FILENAME_KEY': 'indeed_output_filename',
+    'PROFILE_DIR': '/tmp/indeed-profile',
+    'CHROMIUM_ARGS': [
+        '--disable-gpu',
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-blink-features=AutomationControlled',
+        '--disable-features=IsolateOrigins,site-per-process'
+    ],
     'USERNAME_SELECTORS': [
         'input[type="email"]',
         'input[name="email"]',
@@ -82,6 +95,18 @@ CONFIG = {
         'Download',
         'Export candidates'
     ],
+    'DOWNLOAD_SELECTORS': [
+        'a[download]',
+        'a[href$=".csv"]',
+        'button[data-test*="export"]',
+        'button:has-text("Export")',
+        'button:has-text("Download")',
+        'a:has-text("Download CSV")',
+        '.export-button',
+        '.download-button',
+        '[data-testid="export"]',
+        '[data-testid="download"]'
+    ],
     'CANDIDATES_SELECTORS': [
         'a[href*="candidates"]',
         'a[href*="applicants"]',
@@ -92,29 +117,63 @@ CONFIG = {
     ]
 }
 
-async def try_fill(page: Page, selectors: list, value: str) -> bool:
-    """Try to fill a field using multiple selectors"""
-    for selector in selectors:
-        try:
-            element = await page.query_selector(selector)
-            if element:
-                await page.fill(selector, value)
-                return True
-        except Exception:
-            continue
-    return False
+# Selector unions resolved once at import time; each becomes a single locator query
+USERNAME_CSS = ', '.join(CONFIG['USERNAME_SELECTORS'])
+PASSWORD_CSS = ', '.join(CONFIG['PASSWORD_SELECTORS'])
+LOGIN_CSS = ', '.join(CONFIG['LOGIN_BUTTON_SELECTORS'])
+DOWNLOAD_CSS = ', '.join(CONFIG['DOWNLOAD_SELECTORS'])
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+TRACKER_URL_REGEX = re.compile(r'doubleclick\.net|googletagmanager\.com|google-analytics\.com|segment\.(?:io|com)|hotjar\.com|facebook\.net')
+LOGIN_INDICATOR_REGEX = re.compile(r'^(?:Download|Export|Export CSV)$')
+DOWNLOAD_TEXT_REGEX = re.compile('^(?:' + '|'.join(map(re.escape, CONFIG['DOWNLOAD_BUTTON_TEXTS'])) + ')$', re.I)
+
+def visible_only(css: str) -> str:
+    """Restrict a selector union to visible matches, so .first skips hidden decoys"""
+    return f'{css} >> visible=true'
+
+def download_button_locator(page: Page):
+    """Buttons or links whose accessible name is one of the download texts"""
+    return page.get_by_role('button', name=DOWNLOAD_TEXT_REGEX).or_(
+        page.get_by_role('link', name=DOWNLOAD_TEXT_REGEX))
+
+def download_controls_locator(page: Page):
+    """Visible download/export controls, by selector or by accessible name"""
+    return page.locator(visible_only(DOWNLOAD_CSS)).or_(download_button_locator(page))
+
+async def wait_for_download_controls(page: Page, timeout: int = 10000) -> bool:
+    """Wait until a download/export control is visible on the page"""
+    try:
+        await download_controls_locator(page).first.wait_for(timeout=timeout)
+        return True
+    except Exception:
+        return False
 
-async def try_click(page: Page, selectors: list) -> bool:
-    """Try to click an element using multiple selectors"""
-    for selector in selectors:
-        try:
-            element = await page.query_selector(selector)
-            if element:
-                await page.click(selector)
-                return True
-        except Exception:
-            continue
-    return False
+async def try_fill(page: Page, css: str, value: str) -> bool:
+    """Try to fill the first visible field matching a CSS selector union"""
+    try:
+        await page.locator(visible_only(css)).first.fill(value, timeout=2000)
+        return True
+    except Exception:
+        return False
+
+async def try_click(page: Page, css: str) -> bool:
+    """Try to click the first visible element matching a CSS selector union"""
+    try:
+        await page.locator(visible_only(css)).first.click(timeout=2000)
+        return True
+    except Exception:
+        return False
+
+async def block_unneeded_resources(context) -> None:
+    """Abort images, fonts, media, stylesheets and tracker requests for every page in the context"""
+    async def handle_route(route):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or TRACKER_URL_REGEX.search(request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route('**/*', handle_route)
 
 async def load_cookies_into_context(actor: Actor, context) -> bool:
     """Load cookies from Apify KV store"""
@@ -128,6 +187,25 @@ async def load_cookies_into_context(actor: Actor, context) -> bool:
         actor.log.warning(f'Failed to load cookies: {e}')
     return False
 
+async def load_cookies_into_session(actor: Actor, session: aiohttp.ClientSession) -> bool:
+    """Load cookies from Apify KV store into the HTTP session's cookie jar"""
+    try:
+        cookies = await actor.get_value(CONFIG['COOKIES_KEY'])
+        if cookies:
+            for cookie in cookies:
+                morsel = Morsel()
+                morsel.set(cookie['name'], cookie['value'], cookie['value'])
+                morsel['domain'] = cookie.get('domain', '')
+                morsel['path'] = cookie.get('path', '/')
+                if cookie.get('secure'):
+                    morsel['secure'] = True
+                session.cookie_jar.update_cookies({cookie['name']: morsel})
+            actor.log.info('Loaded cookies from KV store into HTTP session.')
+            return True
+    except Exception as e:
+        actor.log.warning(f'Failed to load cookies into HTTP session: {e}')
+    return False
+
 async def save_cookies_from_context(actor: Actor, context) -> None:
     """Save cookies to Apify KV store"""
     try:
@@ -137,161 +215,136 @@ async def save_cookies_from_context(actor: Actor, context) -> None:
     except Exception as e:
         actor.log.warning(f'Failed to save cookies: {e}')
 
-async def post_file_to_webhook(actor: Actor, filepath: str, webhook_url: str) -> bool:
+async def post_file_to_webhook(actor: Actor, session: aiohttp.ClientSession, filepath: str, webhook_url: str) -> bool:
     """Post file to webhook URL"""
     if not webhook_url:
         actor.log.info('No webhook URL provided; skipping POST.')
         return False
 
     try:
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            with open(filepath, 'rb') as f:
-                data = aiohttp.FormData()
-                data.add_field('file', f, filename=os.path.basename(filepath))
-                
-                async with session.post(webhook_url, data=data, timeout=60) as response:
-                    if 200 <= response.status < 300:
-                        actor.log.info(f'Successfully posted CSV to webhook: {webhook_url}')
-                        return True
-                    else:
-                        actor.log.warning(f'Webhook POST returned status {response.status}')
-                        return False
+        # aiohttp streams the open file; a 1 MiB buffer cuts the number of read syscalls
+        with open(filepath, 'rb', buffering=1024 * 1024) as f:
+            data = aiohttp.FormData()
+            data.add_field('file', f, filename=os.path.basename(filepath))
+            
+            async with session.post(webhook_url, data=data) as response:
+                if 200 <= response.status < 300:
+                    actor.log.info(f'Successfully posted CSV to webhook: {webhook_url}')
+                    return True
+                else:
+                    actor.log.warning(f'Webhook POST returned status {response.status}')
+                    return False
     except Exception as e:
         actor.log.error(f'Failed to POST file to webhook: {e}')
         return False
 
-async def download_csv_via_click(page: Page, actor: Actor, config: Dict[str, Any]) -> Optional[str]:
+def is_csv_response(response) -> bool:
+    """Whether a network response is a successful CSV body"""
+    if not response.ok:
+        return False
+    content_type = response.headers.get('content-type') or ''
+    return 'csv' in content_type or response.url.lower().endswith('.csv')
+
+async def click_and_save_csv(page: Page, element, out_path: str, timeout: int) -> bool:
+    """Click an element and save whichever arrives first: a download or a CSV response body"""
+    download_task = asyncio.ensure_future(page.wait_for_event('download', timeout=timeout))
+    response_task = asyncio.ensure_future(page.wait_for_event('response', predicate=is_csv_response, timeout=timeout))
+    pending = {download_task, response_task}
+    try:
+        # Let both waiters register their listeners before the click goes out
+        await asyncio.sleep(0)
+        await element.click()
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception():
+                    continue
+                if task is download_task:
+                    await task.result().save_as(out_path)
+                    return True
+                try:
+                    body = await task.result().body()
+                except Exception:
+                    # Responses that turn into downloads have no body; keep waiting for the download
+                    continue
+                async with aiofiles.open(out_path, 'wb') as f:
+                    await f.write(body)
+                return True
+        return False
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+def csv_output_path(config: Dict[str, Any]) -> str:
+    """Final location of the downloaded CSV"""
+    return f"/tmp/{config.get('download_filename', 'indeed-output.csv')}"
+
+async def download_csv_via_click(page: Page, actor: Actor, config: Dict[str, Any], out_path: str) -> Optional[str]:
     """Download CSV by clicking download buttons"""
     timeout = config.get('timeout', 30000)
 
-    # Try clicking by text first
-    for text in CONFIG['DOWNLOAD_BUTTON_TEXTS']:
-        try:
-            element = await page.query_selector(f'text="{text}"')
-            if element:
-                actor.log.info(f'Clicking download button by text: {text}')
-                
-                # Set up download listener
-                download_info = None
-                
-                async def handle_download(download):
-                    nonlocal download_info
-                    download_info = download
-                
-                page.on('download', handle_download)
-                
-                await page.click(f'text="{text}"')
-                
-                # Wait for download
-                await asyncio.sleep(5)
-                
-                if download_info:
-                    out_path = f"/tmp/{config.get('download_filename', 'indeed-output.csv')}"
-                    await download_info.save_as(out_path)
-                    
-                    if os.path.exists(out_path):
-                        return out_path
-        except Exception as e:
-            actor.log.warning(f'Download timed out after clicking text "{text}": {e}')
-
-    # Try generic selectors
-    selector_candidates = [
-        'a[download]',
-        'a[href$=".csv"]',
-        'button[data-test*="export"]',
-        'button:has-text("Export")',
-        'button:has-text("Download")',
-        'a:has-text("Download CSV")',
-        '.export-button',
-        '.download-button',
-        '[data-testid="export"]',
-        '[data-testid="download"]'
+    # Try buttons/links by accessible name first, then the generic selectors
+    candidates = [
+        ('role', download_button_locator(page).first),
+        ('selector', page.locator(visible_only(DOWNLOAD_CSS)).first),
     ]
 
-    for selector in selector_candidates:
+    for kind, element in candidates:
         try:
-            element = await page.query_selector(selector)
-            if element:
-                actor.log.info(f'Clicking download element by selector: {selector}')
-                
-                download_info = None
-                
-                async def handle_download(download):
-                    nonlocal download_info
-                    download_info = download
+            if await element.count():
+                actor.log.info(f'Clicking download element by {kind}')
                 
-                page.on('download', handle_download)
-                
-                await element.click()
-                
-                # Wait for download
-                await asyncio.sleep(5)
-                
-                if download_info:
-                    out_path = f"/tmp/{config.get('download_filename', 'indeed-output.csv')}"
-                    await download_info.save_as(out_path)
-                    
-                    if os.path.exists(out_path):
-                        return out_path
+                if await click_and_save_csv(page, element, out_path, timeout):
+                    return out_path
+                actor.log.warning(f'Download timed out after clicking download {kind}')
         except Exception as e:
-            actor.log.warning(f'Download timed out after clicking selector "{selector}": {e}')
+            actor.log.warning(f'Download failed after clicking download {kind}: {e}')
 
     return None
 
-async def direct_download_by_url(page: Page, actor: Actor, config: Dict[str, Any]) -> Optional[str]:
+async def stream_to_file(response: aiohttp.ClientResponse, out_path: str) -> int:
+    """Stream a response body to disk in chunks and return the number of bytes written"""
+    written = 0
+    async with aiofiles.open(out_path, 'wb') as f:
+        async for chunk in response.content.iter_chunked(65536):
+            await f.write(chunk)
+            written += len(chunk)
+    return written
+
+async def direct_download_by_url(session: aiohttp.ClientSession, actor: Actor, config: Dict[str, Any], out_path: str) -> Optional[str]:
     """Download CSV directly from URL"""
     try:
         csv_url = config.get('csv_download_url', '')
         if csv_url.lower().endswith('.csv'):
             actor.log.info('CSV URL looks direct; attempting direct GET')
             
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.get(csv_url, timeout=60) as response:
-                    if response.status == 200:
-                        content = await response.read()
-                        out_path = f"/tmp/{config.get('download_filename', 'indeed-output.csv')}"
-                        
-                        with open(out_path, 'wb') as f:
-                            f.write(content)
-                        
-                        if os.path.exists(out_path):
-                            return out_path
+            async with session.get(csv_url) as response:
+                content_type = response.headers.get('Content-Type', '')
+                if 200 <= response.status < 300 and 'text/html' not in content_type:
+                    await stream_to_file(response, out_path)
+                    return out_path
     except Exception as e:
         actor.log.debug(f'Direct download attempt failed: {e}')
 
     return None
 
-async def scan_for_csv_links(page: Page, actor: Actor, config: Dict[str, Any]) -> Optional[str]:
+async def scan_for_csv_links(page: Page, session: aiohttp.ClientSession, actor: Actor, config: Dict[str, Any], out_path: str) -> Optional[str]:
     """Scan page for CSV links and download"""
     try:
-        links = await page.query_selector_all('a')
-        for link in links:
-            href = await link.get_attribute('href') or ''
-            if href and '.csv' in href:
-                actor.log.info(f'Found CSV link: {href} — attempting GET.')
-                
-                # Make absolute URL
-                if href.startswith('http'):
-                    csv_link = href
-                else:
-                    base_url = page.url.rstrip('/')
-                    csv_link = f"{base_url}/{href.lstrip('/')}"
-                
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(csv_link, timeout=60) as response:
-                        if response.status == 200:
-                            content = await response.read()
-                            if len(content) > 50:  # Ensure it's not empty
-                                out_path = f"/tmp/{config.get('download_filename', 'indeed-output.csv')}"
-                                
-                                with open(out_path, 'wb') as f:
-                                    f.write(content)
-                                
-                                if os.path.exists(out_path):
-                                    return out_path
+        # e.href is already resolved to an absolute URL by the browser; dedupe in-page
+        hrefs = await page.eval_on_selector_all('a[href*=".csv"]', '(els) => [...new Set(els.map(e => e.href))]')
+        for csv_link in hrefs:
+            actor.log.info(f'Found CSV link: {csv_link} — attempting GET.')
+            
+            async with session.get(csv_link) as response:
+                # Ensure it's not empty; trust Content-Length when the server sends it
+                if response.status == 200 and (response.content_length is None or response.content_length > 50):
+                    written = await stream_to_file(response, out_path)
+                    
+                    if written > 50:
+                        return out_path
     except Exception as e:
         actor.log.debug(f'Fallback link scan failed: {e}')
 
@@ -311,14 +364,17 @@ async def upload_to_kv_store(actor: Actor, file_path: str, filename: str) -> boo
         actor.log.warning(f'Failed to upload CSV to KV store: {e}')
         return False
 
-async def check_login_status(page: Page, actor: Actor) -> bool:
+async def check_login_status(page: Page, actor: Actor, timeout: int = 10000) -> bool:
     """Check if already logged in"""
+    controls = download_controls_locator(page)
     try:
-        download_element = await page.query_selector('text="Download"')
-        export_element = await page.query_selector('text="Export"')
-        export_csv_element = await page.query_selector('text="Export CSV"')
+        # Resolves on whichever renders first: download controls or a login form
+        try:
+            await controls.or_(page.locator(visible_only(USERNAME_CSS))).first.wait_for(timeout=timeout)
+        except Exception:
+            actor.log.debug('Neither download controls nor a login form appeared in time.')
 
-        if download_element or export_element or export_csv_element:
+        if await controls.or_(page.get_by_text(LOGIN_INDICATOR_REGEX)).count() > 0:
             actor.log.info('Detected download controls without fresh login — using existing cookies.')
             return True
         else:
@@ -333,10 +389,19 @@ async def perform_login(page: Page, actor: Actor, config: Dict[str, Any]) -> boo
     try:
         actor.log.info('Performing login flow.')
         await page.goto(config.get('login_url', 'https://employers.indeed.com/'), 
-                       wait_until='networkidle', timeout=30000)
+                       wait_until='domcontentloaded', timeout=15000)
+        try:
+            await page.locator(visible_only(USERNAME_CSS)).first.wait_for(timeout=10000)
+        except Exception:
+            actor.log.debug('Username field did not appear within 10s — trying to fill anyway.')
+
+        # Single-page forms show both fields at once; two-step forms only show the email.
+        # Fills stay sequential because fill() types into whichever field has focus.
+        single_page = await page.locator(visible_only(PASSWORD_CSS)).count() > 0
+        filled_user = await try_fill(page, USERNAME_CSS, config['username'])
+        if single_page:
+            filled_pass = await try_fill(page, PASSWORD_CSS, config['password'])
 
-        # Fill email/username
-        filled_user = await try_fill(page, CONFIG['USERNAME_SELECTORS'], config['username'])
         if not filled_user:
             actor.log.warning('Could not find username/email field using common selectors - trying generic input')
             try:
@@ -344,8 +409,15 @@ async def perform_login(page: Page, actor: Actor, config: Dict[str, Any]) -> boo
             except Exception:
                 actor.log.error('Unable to autofill username field; login may fail.')
 
-        # Fill password
-        filled_pass = await try_fill(page, CONFIG['PASSWORD_SELECTORS'], config['password'])
+        # Two-step forms: submit the email, then fill the password on the next page
+        if not single_page:
+            await try_click(page, LOGIN_CSS)
+            try:
+                await page.locator(PASSWORD_CSS).first.wait_for(timeout=10000)
+            except Exception:
+                actor.log.debug('Password field did not appear within 10s after submitting email.')
+            filled_pass = await try_fill(page, PASSWORD_CSS, config['password'])
+
         if not filled_pass:
             actor.log.warning('Could not find password field using common selectors - trying generic input')
             try:
@@ -356,64 +428,149 @@ async def perform_login(page: Page, actor: Actor, config: Dict[str, Any]) -> boo
                 actor.log.error('Unable to autofill password field; login may fail.')
 
         # Click login button
-        clicked_login = await try_click(page, CONFIG['LOGIN_BUTTON_SELECTORS'])
+        clicked_login = await try_click(page, LOGIN_CSS)
         if not clicked_login:
             try:
                 await page.click('text="Sign in"')
             except Exception:
                 actor.log.warning('Could not click login button automatically; you may need to update selectors.')
 
-        # Wait for navigation after login
+        # Wait for navigation away from the login form
         try:
-            await page.wait_for_load_state('networkidle', timeout=20000)
+            await page.locator(PASSWORD_CSS).first.wait_for(state='detached', timeout=20000)
         except Exception:
-            actor.log.debug('Network idle wait timed out after login — continuing with checks.')
+            actor.log.debug('Login form still present after 20s — continuing with checks.')
 
         return True
     except Exception as e:
         actor.log.error(f'Login failed: {e}')
         return False
 
-async def download_csv(page: Page, actor: Actor, config: Dict[str, Any]) -> Optional[str]:
+async def download_csv(page: Page, session: aiohttp.ClientSession, actor: Actor, config: Dict[str, Any], out_path: str) -> Optional[str]:
     """Download CSV using multiple methods"""
-    # First attempt: direct .csv URL fetch
-    if config.get('csv_download_url', '').lower().endswith('.csv'):
-        result = await direct_download_by_url(page, actor, config)
-        if result:
-            return result
-
-    # Second: try clicking download elements
-    result = await download_csv_via_click(page, actor, config)
+    # A direct .csv URL has already been tried over HTTP before the browser started
+    # First: try clicking download elements
+    result = await download_csv_via_click(page, actor, config, out_path)
     if result:
         return result
 
-    # Third: as fallback, try to find any link that points to .csv and GET it
-    result = await scan_for_csv_links(page, actor, config)
+    # Second: as fallback, try to find any link that points to .csv and GET it
+    result = await scan_for_csv_links(page, session, actor, config, out_path)
     if result:
         return result
 
     return None
 
-async def process_urls(page: Page, actor: Actor, config: Dict[str, Any]) -> Optional[str]:
-    """Process all start URLs and attempt to download CSV from each"""
+async def process_urls(context, session: aiohttp.ClientSession, actor: Actor, config: Dict[str, Any]) -> Optional[str]:
+    """Process all start URLs concurrently and return the first downloaded CSV"""
     start_urls = config.get('start_urls', [])
-    
-    for i, start_url in enumerate(start_urls):
-        try:
-            actor.log.info(f'Processing URL {i+1}/{len(start_urls)}: {start_url}')
-            
-            # Navigate to the URL
-            await page.goto(start_url, wait_until='networkidle', timeout=30000)
-            
-            # Attempt CSV download
-            out_path = await download_csv(page, actor, config)
-            if out_path:
-                return out_path
-        except Exception as e:
-            actor.log.warning(f'Failed to process URL {start_url}: {e}')
-    
+    sem = asyncio.Semaphore(max(1, int(config.get('url_concurrency', 4))))
+
+    # Each worker writes its own part file; only the winner is moved to the final name
+    final_path = csv_output_path(config)
+    part_paths = [f'{final_path}.{i}.part' for i in range(len(start_urls))]
+
+    async def worker(i: int, start_url: str) -> Optional[str]:
+        async with sem:
+            page = None
+            try:
+                actor.log.info(f'Processing URL {i+1}/{len(start_urls)}: {start_url}')
+                page = await context.new_page()
+
+                # Navigate to the URL
+                await page.goto(start_url, wait_until='domcontentloaded', timeout=15000)
+                await wait_for_download_controls(page)
+
+                # Attempt CSV download
+                return await download_csv(page, session, actor, config, part_paths[i])
+            except Exception as e:
+                actor.log.warning(f'Failed to process URL {start_url}: {e}')
+                return None
+            finally:
+                if page:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+
+    # Python 3.10 base image has no TaskGroup; cancel the siblings by hand
+    tasks = [asyncio.create_task(worker(i, url)) for i, url in enumerate(start_urls)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            part_path = await next_done
+            if part_path:
+                os.replace(part_path, final_path)
+                return final_path
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for part_path in part_paths:
+            try:
+                os.remove(part_path)
+            except FileNotFoundError:
+                pass
+
     return None
 
+async def deliver_csv(actor: Actor, session: aiohttp.ClientSession, out_path: str, config: Dict[str, Any]) -> bool:
+    """Upload the CSV to the KV store and post it to the webhook; return whether the webhook was sent"""
+    # KV upload and webhook POST are independent, so run them concurrently
+    upload_task = asyncio.create_task(upload_to_kv_store(actor, out_path, config['download_filename']))
+    webhook_task = None
+    if config['n8n_webhook_url']:
+        webhook_task = asyncio.create_task(post_file_to_webhook(actor, session, out_path, config['n8n_webhook_url']))
+
+    await upload_task
+    return await webhook_task if webhook_task else False
+
+async def launch_browser_context(p, actor: Actor):
+    """Launch Chromium with the persistent profile and prime it with saved cookies"""
+    context = await p.chromium.launch_persistent_context(
+        CONFIG['PROFILE_DIR'], headless=True, args=CONFIG['CHROMIUM_ARGS'])
+    await block_unneeded_resources(context)
+
+    # Session cookies never reach the profile on disk, so check the live jar, not the directory
+    profile_cookies = await context.cookies()
+    if any('indeed.' in cookie.get('domain', '') for cookie in profile_cookies):
+        actor.log.debug('Reusing cookies from existing browser profile.')
+    else:
+        try:
+            await load_cookies_into_context(actor, context)
+        except Exception:
+            actor.log.debug('No cookies loaded (or failed). Proceeding to login flow.')
+    return context
+
+async def context_is_usable(context) -> bool:
+    """Whether the browser behind a context still answers requests"""
+    try:
+        await context.cookies()
+        return True
+    except Exception:
+        return False
+
+async def close_quietly(context) -> None:
+    """Close a browser context, ignoring errors"""
+    try:
+        await context.close()
+    except Exception:
+        pass
+
+def build_success_output(config: Dict[str, Any], out_path: str, start_time: float,
+                         webhook_sent: bool, download_method: str) -> Dict[str, Any]:
+    """Build the dataset record for a successful run"""
+    return {
+        'status': 'Success',
+        'csv_type': config['csv_type'],
+        'csv_filename': config['download_filename'],
+        'file_size': os.path.getsize(out_path) if out_path and os.path.exists(out_path) else None,
+        'download_method': download_method,
+        'execution_time': time.time() - start_time,
+        'cookies_saved': config['save_cookies'],
+        'webhook_sent': webhook_sent,
+        'job_id': config['job_id']
+    }
+
 async def main_logic():
     """Main execution logic for the Indeed CSV Downloader Actor"""
     start_time = time.time()
@@ -434,6 +591,8 @@ async def main_logic():
                 'download_filename': input_data.get('download_filename', 'indeed-output.csv'),
                 'max_retries': input_data.get('max_retries', 2),
                 'timeout': input_data.get('timeout', 30000),
+                'url_concurrency': input_data.get('url_concurrency', 4),
+                'csv_download_url': input_data.get('csv_download_url', ''),
                 'csv_type': input_data.get('csv_type', 'candidates'),
                 'job_id': input_data.get('job_id', '')
             }
@@ -447,104 +606,106 @@ async def main_logic():
             Actor.log.info('Starting Indeed CSV Downloader actor...')
             Actor.log.debug(f'Inputs: username={config["username"]} csv_type={config["csv_type"]} webhook_provided={"yes" if config["n8n_webhook_url"] else "no"}')
             
-            # Provide retries for the whole flow
-            for attempt in range(1, config['max_retries'] + 1):
-                Actor.log.info(f'Flow attempt {attempt}/{config["max_retries"]}')
-                
-                try:
-                    async with async_playwright() as p:
-                        browser = await p.chromium.launch(headless=True)
-                        context = await browser.new_context()
-                        
-                        # Try to load cookies if present
-                        try:
-                            await load_cookies_into_context(Actor, context)
-                        except Exception:
-                            Actor.log.debug('No cookies loaded (or failed). Proceeding to login flow.')
-                        
-                        page = await context.new_page()
-                        
-                        # Check if already logged in
-                        logged_in = False
-                        try:
-                            # Try visiting the first start_url to check login status
-                            if config['start_urls']:
-                                await page.goto(config['start_urls'][0], wait_until='networkidle', timeout=30000)
-                                logged_in = await check_login_status(page, Actor)
-                        except Exception:
-                            Actor.log.debug('Visiting first start_url to check cookies failed/redirected; will open login page.')
-                        
-                        # Perform login if needed
-                        if not logged_in:
-                            if not await perform_login(page, Actor, config):
-                                raise RuntimeError('Login failed')
-                            
-                            # Save cookies if enabled
-                            if config['save_cookies']:
-                                await save_cookies_from_context(Actor, context)
-                        
-                        # Process all start URLs and attempt download
-                        out_path = await process_urls(page, Actor, config)
-                        if not out_path:
-                            raise RuntimeError('Unable to find or download CSV from any provided URL. Please verify start_urls and selectors.')
-                        
-                        Actor.log.info(f'CSV downloaded to {out_path}')
-                        
-                        # Upload to Apify KV store
-                        kv_upload_success = await upload_to_kv_store(Actor, out_path, config['download_filename'])
-                        
-                        # Post to n8n webhook if provided
-                        webhook_sent = False
-                        if config['n8n_webhook_url']:
-                            webhook_sent = await post_file_to_webhook(Actor, out_path, config['n8n_webhook_url'])
-                        
-                        # Close browser
-                        try:
-                            await browser.close()
-                        except Exception:
-                            pass
-                        
-                        # Calculate execution time
-                        execution_time = time.time() - start_time
-
-                        # Create output
-                        output = {
-                            'status': 'Success',
-                            'csv_type': config['csv_type'],
-                            'csv_filename': config['download_filename'],
-                            'file_size': os.path.getsize(out_path) if out_path and os.path.exists(out_path) else None,
-                            'download_method': 'multiple_attempts',
-                            'execution_time': execution_time,
-                            'cookies_saved': config['save_cookies'],
-                            'webhook_sent': webhook_sent,
-                            'job_id': config['job_id']
-                        }
-                        
-                        # Push output to dataset
-                        await Actor.push_data(output)
-                        
+            # One pooled HTTP session for every CSV GET and webhook POST
+            http_timeout = aiohttp.ClientTimeout(total=60)
+            connector = aiohttp.TCPConnector(limit=16, ttl_dns_cache=300)
+            async with aiohttp.ClientSession(timeout=http_timeout, connector=connector) as session:
+                # A direct .csv URL only needs the saved cookies, not a browser
+                if config['csv_download_url'].lower().endswith('.csv'):
+                    await load_cookies_into_session(Actor, session)
+                    out_path = await direct_download_by_url(session, Actor, config, csv_output_path(config))
+                    if out_path:
+                        Actor.log.info(f'CSV downloaded over HTTP to {out_path}')
+                        webhook_sent = await deliver_csv(Actor, session, out_path, config)
+                        await Actor.push_data(build_success_output(config, out_path, start_time, webhook_sent, 'direct_url'))
                         Actor.log.info('✅ CSV download flow completed successfully.')
                         return
+                    Actor.log.info('Direct HTTP download did not return a CSV; falling back to browser flow.')
+
+                async with async_playwright() as p:
+                    context = None
+                    try:
+                        # Provide retries for the whole flow
+                        for attempt in range(1, config['max_retries'] + 1):
+                            Actor.log.info(f'Flow attempt {attempt}/{config["max_retries"]}')
+                            page = None
                         
-                except Exception as e:
-                    Actor.log.error(f'Flow attempt {attempt} failed: {e}')
-                    Actor.log.debug(traceback.format_exc())
-                    
-                    if attempt < config['max_retries']:
-                        wait = 5 * attempt
-                        Actor.log.info(f'Retrying in {wait}s...')
-                        await asyncio.sleep(wait)
-                    else:
-                        Actor.log.critical('All attempts failed. Exiting with error.')
-                        
-                        # Create error output
-                        output = {
-                            'status': 'Failed',
-                            'error': str(e),
-                            'execution_time': time.time() - start_time
-                        }
-                        await Actor.push_data(output)
-                        raise
+                            try:
+                                # One browser for every attempt; only relaunch after a failed launch or crash
+                                if context is None:
+                                    context = await launch_browser_context(p, Actor)
+                                page = await context.new_page()
+                            
+                                # Check if already logged in
+                                logged_in = False
+                                try:
+                                    # Try visiting the first start_url to check login status
+                                    if config['start_urls']:
+                                        await page.goto(config['start_urls'][0], wait_until='domcontentloaded', timeout=15000)
+                                        logged_in = await check_login_status(page, Actor)
+                                except Exception:
+                                    Actor.log.debug('Visiting first start_url to check cookies failed/redirected; will open login page.')
+                            
+                                # Perform login if needed
+                                if not logged_in:
+                                    if not await perform_login(page, Actor, config):
+                                        raise RuntimeError('Login failed')
+                                
+                                    # Save cookies if enabled
+                                    if config['save_cookies']:
+                                        await save_cookies_from_context(Actor, context)
+                            
+                                # Process all start URLs and attempt download
+                                out_path = await process_urls(context, session, Actor, config)
+                                if not out_path:
+                                    raise RuntimeError('Unable to find or download CSV from any provided URL. Please verify start_urls and selectors.')
+                            
+                                Actor.log.info(f'CSV downloaded to {out_path}')
+                            
+                                # Close the browser while the CSV is being delivered
+                                webhook_sent, _ = await asyncio.gather(
+                                    deliver_csv(Actor, session, out_path, config), close_quietly(context))
+                            
+                                # Push output to dataset
+                                await Actor.push_data(build_success_output(config, out_path, start_time, webhook_sent, 'multiple_attempts'))
+                            
+                                Actor.log.info('✅ CSV download flow completed successfully.')
+                                return
+                            
+                            except Exception as e:
+                                Actor.log.error(f'Flow attempt {attempt} failed: {e}')
+                                Actor.log.debug(traceback.format_exc())
+                            
+                                # A closed or crashed browser can't serve the next attempt
+                                if context is not None and not await context_is_usable(context):
+                                    await close_quietly(context)
+                                    context = None
+                            
+                                if attempt < config['max_retries']:
+                                    # Exponential backoff with jitter, capped at 60s
+                                    wait = min(60, 2 ** attempt * random.uniform(0.5, 1.5))
+                                    Actor.log.info(f'Retrying in {wait:.1f}s...')
+                                    await asyncio.sleep(wait)
+                                else:
+                                    Actor.log.critical('All attempts failed. Exiting with error.')
+                                
+                                    # Create error output
+                                    output = {
+                                        'status': 'Failed',
+                                        'error': str(e),
+                                        'execution_time': time.time() - start_time
+                                    }
+                                    await Actor.push_data(output)
+                                    raise
+                            finally:
+                                if page:
+                                    try:
+                                        await page.close()
+                                    except Exception:
+                                        pass
+                    finally:
+                        if context is not None:
+                            await close_quietly(context)
                         
         except Exception as e:
             Actor.log.critical(f'Critical error in main logic: {e}')